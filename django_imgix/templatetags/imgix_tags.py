@@ -81,6 +81,25 @@ def get_kwargs(alias, aliases, kwargs):
         return aliases[alias]
 
 
+# get_imgix is typically called many times with the same settings, so keep
+# one UrlBuilder per configuration instead of reconstructing it (domain
+# parsing, sign key validation) on every call.
+_builders = {}
+
+
+def get_builder(domains, args):
+    key = (
+        tuple(domains) if isinstance(domains, list) else domains,
+        args.get('use_https'),
+        args.get('sign_key'),
+        args.get('shard_strategy'),
+    )
+    builder = _builders.get(key)
+    if builder is None:
+        builder = _builders[key] = imgix.UrlBuilder(domains, **args)
+    return builder
+
+
 def get_fm(image_url):
     image_end = image_url.split('.')[-1]
     m = FM_PATTERN.match(image_end)
@@ -156,10 +175,7 @@ def get_imgix(image_url, alias=None, wh=None, **kwargs):
     args['sign_with_library_version'] = False
 
     # Get builder instance
-    builder = imgix.UrlBuilder(
-        domains,
-        **args
-    )
+    builder = get_builder(domains, args)
 
     # Has the wh argument been passed? If yes,
     # set w and h arguments accordingly